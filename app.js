@@ -4,11 +4,31 @@ let currentBookingId = null;
 let airplanes = [];
 let flights = [];
 
+// Виртуализация таблицы рейсов
+const FLIGHT_ROW_HEIGHT = 48;      // Фиксированная высота строки (px)
+const DEFAULT_VIEWPORT_HEIGHT = 600; // Если max-height .flights-viewport не задан (px)
+const FLIGHT_ROWS_OVERSCAN = 10;   // Строк сверху и снизу вне видимой области
+const FILTER_DEBOUNCE_MS = 300;
+const flightRowCache = new Map();  // flight.id -> { signature, row }
+let flightsViewportHeight = DEFAULT_VIEWPORT_HEIGHT;
+let flightsScrollScheduled = false;
+let filterDebounceTimer = null;
+let flightsRequestController = null;
+
+const STATS_REFRESH_MS = 30000;
+const STATS_AFTER_WRITE_MS = 6000;  // Сервер пересчитывает снимок не позже ~5 с после изменений
+let statsAfterWriteTimer = null;
+
+// Повтор запросов при перегрузке сервера (429/503)
+const DEFAULT_RETRY_AFTER_MS = 1000;
+const reloadTimers = {};
+
 // Инициализация
 document.addEventListener('DOMContentLoaded', async () => {
     console.log('Приложение загружено');
     await loadInitialData();
     setupEventListeners();
+    setInterval(updateStats, STATS_REFRESH_MS);
 });
 
 // Загрузка данных
@@ -17,7 +37,9 @@ async function loadInitialData() {
     try {
         await Promise.all([
             loadAirplanes(),
-            loadFlights()
+            loadFlights(),
+            loadDestinations(),
+            updateStats()
         ]);
         showMessage('Данные загружены', 'success');
     } catch (error) {
@@ -31,9 +53,11 @@ async function loadInitialData() {
 async function loadAirplanes() {
     try {
         const response = await fetch('/api/airplanes');
+        if (isOverloaded(response)) return scheduleReload('airplanes', loadAirplanes, response, airplanes);
         if (!response.ok) throw new Error('Ошибка загрузки самолетов');
         airplanes = await response.json();
         populateAirplaneSelect();
+        populateAirplaneFilter();
         renderAirplanes();
         return airplanes;
     } catch (error) {
@@ -43,23 +67,51 @@ async function loadAirplanes() {
 }
 
 async function loadFlights() {
+    // Отменяем предыдущий запрос, чтобы устаревший ответ не перезаписал новый
+    if (flightsRequestController) {
+        flightsRequestController.abort();
+    }
+    const controller = new AbortController();
+    flightsRequestController = controller;
+
     try {
-        const response = await fetch('/api/flights');
+        const response = await fetch(`/api/flights${buildFlightsQuery()}`, {
+            signal: controller.signal
+        });
+        if (isOverloaded(response)) return scheduleReload('flights', loadFlights, response, flights);
         if (!response.ok) throw new Error('Ошибка загрузки рейсов');
         flights = await response.json();
         renderFlights();
-        updateFilters();
-        updateStats();
         return flights;
     } catch (error) {
+        if (error.name === 'AbortError') return flights;
         console.error('Ошибка загрузки рейсов:', error);
         throw error;
+    } finally {
+        if (flightsRequestController === controller) {
+            flightsRequestController = null;
+        }
+    }
+}
+
+async function loadDestinations() {
+    try {
+        const response = await fetch('/api/destinations');
+        if (isOverloaded(response)) return scheduleReload('destinations', loadDestinations, response, []);
+        if (!response.ok) throw new Error('Ошибка загрузки направлений');
+        const destinations = await response.json();
+        populateDestinationFilter(destinations);
+        return destinations;
+    } catch (error) {
+        console.error('Ошибка загрузки направлений:', error);
+        throw error;
     }
 }
 
 async function loadBookings(flightId) {
     try {
         const response = await fetch(`/api/flights/${flightId}/bookings`);
+        if (isOverloaded(response)) throw new Error(overloadMessage(response));
         if (!response.ok) throw new Error('Ошибка загрузки броней');
         return await response.json();
     } catch (error) {
@@ -71,6 +123,7 @@ async function loadBookings(flightId) {
 async function loadAvailableFlightsForTransfer(flightId) {
     try {
         const response = await fetch(`/api/flights/${flightId}/available-transfer`);
+        if (isOverloaded(response)) throw new Error(overloadMessage(response));
         if (!response.ok) {
             const error = await response.json();
             throw new Error(error.error || 'Ошибка загрузки рейсов для переноса');
@@ -88,6 +141,7 @@ function renderFlights() {
     if (!container) return;
 
     if (flights.length === 0) {
+        flightRowCache.clear();
         container.innerHTML = `
             <div class="text-center py-5">
                 <i class="bi bi-airplane" style="font-size: 3rem; color: #6c757d;"></i>
@@ -98,66 +152,164 @@ function renderFlights() {
         return;
     }
 
-    let html = '<div class="row">';
+    // Каркас таблицы создается один раз, далее обновляются только строки
+    let viewport = document.getElementById('flightsViewport');
+    if (!viewport) {
+        container.innerHTML = `
+            <div id="flightsViewport" class="flights-viewport">
+                <table class="table table-hover align-middle mb-0">
+                    <thead>
+                        <tr>
+                            <th>Направление</th>
+                            <th>Вылет</th>
+                            <th>Самолет</th>
+                            <th>Места</th>
+                            <th>Броней</th>
+                            <th class="text-end">Действия</th>
+                        </tr>
+                    </thead>
+                    <tbody id="flightsTableBody"></tbody>
+                </table>
+            </div>
+        `;
+        viewport = document.getElementById('flightsViewport');
+        viewport.addEventListener('scroll', onFlightsScroll);
 
-    flights.forEach(flight => {
-        const date = new Date(flight.departure_datetime);
-        const formattedDate = date.toLocaleString('ru-RU', {
-            day: '2-digit',
-            month: '2-digit',
-            year: 'numeric',
-            hour: '2-digit',
-            minute: '2-digit'
-        });
+        // Высота окна берется из CSS, чтобы не дублировать ее в коде
+        const maxHeight = parseFloat(getComputedStyle(viewport).maxHeight);
+        flightsViewportHeight = maxHeight > 0 ? maxHeight : DEFAULT_VIEWPORT_HEIGHT;
+    }
 
-        const isFull = flight.available_seats <= 0;
-        const badgeClass = isFull ? 'bg-danger' : 'bg-success';
-        const badgeText = isFull ? 'Заполнен' : 'Есть места';
+    renderVisibleFlights();
+}
 
-        html += `
-            <div class="col-md-6 col-lg-4 mb-4">
-                <div class="card h-100">
-                    <div class="card-body">
-                        <h5 class="card-title">
-                            <i class="bi bi-geo-alt text-primary"></i>
-                            ${flight.destination}
-                        </h5>
-                        <h6 class="card-subtitle mb-2 text-muted">
-                            <i class="bi bi-clock"></i> ${formattedDate}
-                        </h6>
-                        <p class="card-text">
-                            <i class="bi bi-airplane"></i> ${flight.airplane.name}
-                            <br><small>Вместимость: ${flight.airplane.capacity} мест</small>
-                        </p>
-
-                        <div class="d-flex justify-content-between align-items-center mb-3">
-                            <div>
-                                <span class="badge ${badgeClass}">${badgeText}</span>
-                                <span class="badge bg-info ms-1">Свободно: ${flight.available_seats}</span>
-                            </div>
-                            <span class="badge bg-secondary">Броней: ${flight.bookings_count}</span>
-                        </div>
-
-                        <div class="btn-group w-100">
-                            <button class="btn btn-outline-primary btn-sm"
-                                    onclick="showBookings('${flight.id}', '${flight.destination}')">
-                                <i class="bi bi-ticket"></i> Брони
-                            </button>
-                            <button class="btn btn-outline-warning btn-sm" onclick="editFlight('${flight.id}')">
-                                <i class="bi bi-pencil"></i>
-                            </button>
-                            <button class="btn btn-outline-danger btn-sm" onclick="deleteFlightConfirm('${flight.id}', '${flight.destination}')">
-                                <i class="bi bi-trash"></i>
-                            </button>
-                        </div>
-                    </div>
-                </div>
+function onFlightsScroll() {
+    if (flightsScrollScheduled) return;
+    flightsScrollScheduled = true;
+    requestAnimationFrame(() => {
+        flightsScrollScheduled = false;
+        renderVisibleFlights();
+    });
+}
+
+// Рендерит только строки, попадающие в видимую область прокрутки
+function renderVisibleFlights() {
+    const viewport = document.getElementById('flightsViewport');
+    const tbody = document.getElementById('flightsTableBody');
+    if (!viewport || !tbody) return;
+
+    // Окно считается по максимальной высоте: при первом рендере и на скрытой
+    // вкладке clientHeight еще не отражает итоговый размер таблицы
+    const visibleCount = Math.ceil(flightsViewportHeight / FLIGHT_ROW_HEIGHT);
+    const firstVisible = Math.floor(viewport.scrollTop / FLIGHT_ROW_HEIGHT);
+    const start = Math.max(0, firstVisible - FLIGHT_ROWS_OVERSCAN);
+    const end = Math.min(flights.length, firstVisible + visibleCount + FLIGHT_ROWS_OVERSCAN);
+
+    const nodes = [createSpacerRow(start * FLIGHT_ROW_HEIGHT)];
+    const renderedIds = new Set();
+
+    for (let i = start; i < end; i++) {
+        const flight = flights[i];
+        nodes.push(getFlightRow(flight));
+        renderedIds.add(flight.id);
+    }
+
+    nodes.push(createSpacerRow((flights.length - end) * FLIGHT_ROW_HEIGHT));
+
+    // Строки вне окна больше не нужны
+    for (const id of flightRowCache.keys()) {
+        if (!renderedIds.has(id)) flightRowCache.delete(id);
+    }
+
+    patchChildren(tbody, nodes);
+}
+
+// Возвращает строку рейса из кэша или создает новую, если данные изменились
+function getFlightRow(flight) {
+    const signature = [
+        flight.departure_datetime,
+        flight.destination,
+        flight.airplane.id,
+        flight.airplane.name,
+        flight.airplane.capacity,
+        flight.bookings_count,
+        flight.available_seats
+    ].join('|');
+
+    const cached = flightRowCache.get(flight.id);
+    if (cached && cached.signature === signature) {
+        return cached.row;
+    }
+
+    const row = cached ? cached.row : document.createElement('tr');
+    row.dataset.flightId = flight.id;
+    row.style.height = `${FLIGHT_ROW_HEIGHT}px`;
+    row.innerHTML = renderFlightRowCells(flight);
+    flightRowCache.set(flight.id, { signature, row });
+    return row;
+}
+
+function renderFlightRowCells(flight) {
+    const date = new Date(flight.departure_datetime);
+    const formattedDate = date.toLocaleString('ru-RU', {
+        day: '2-digit',
+        month: '2-digit',
+        year: 'numeric',
+        hour: '2-digit',
+        minute: '2-digit'
+    });
+
+    const isFull = flight.available_seats <= 0;
+    const badgeClass = isFull ? 'bg-danger' : 'bg-success';
+    const badgeText = isFull ? 'Заполнен' : `Свободно: ${flight.available_seats}`;
+
+    return `
+        <td class="text-truncate">
+            <i class="bi bi-geo-alt text-primary"></i> ${flight.destination}
+        </td>
+        <td class="text-nowrap"><i class="bi bi-clock"></i> ${formattedDate}</td>
+        <td class="text-truncate">
+            ${flight.airplane.name}
+            <small class="text-muted">(${flight.airplane.capacity} мест)</small>
+        </td>
+        <td><span class="badge ${badgeClass}">${badgeText}</span></td>
+        <td><span class="badge bg-secondary">${flight.bookings_count}</span></td>
+        <td class="text-end">
+            <div class="btn-group btn-group-sm">
+                <button class="btn btn-outline-primary"
+                        onclick="showBookings('${flight.id}', '${flight.destination}')">
+                    <i class="bi bi-ticket"></i> Брони
+                </button>
+                <button class="btn btn-outline-warning" onclick="editFlight('${flight.id}')">
+                    <i class="bi bi-pencil"></i>
+                </button>
+                <button class="btn btn-outline-danger" onclick="deleteFlightConfirm('${flight.id}', '${flight.destination}')">
+                    <i class="bi bi-trash"></i>
+                </button>
             </div>
-        `;
+        </td>
+    `;
+}
+
+function createSpacerRow(height) {
+    const row = document.createElement('tr');
+    row.className = 'flights-spacer';
+    row.innerHTML = `<td colspan="6" style="height: ${height}px;"></td>`;
+    return row;
+}
+
+// Приводит дочерние элементы к нужному порядку, перемещая только отличающиеся узлы
+function patchChildren(parent, nodes) {
+    nodes.forEach((node, index) => {
+        const current = parent.children[index];
+        if (current !== node) {
+            parent.insertBefore(node, current || null);
+        }
     });
 
-    html += '</div>';
-    container.innerHTML = html;
+    while (parent.children.length > nodes.length) {
+        parent.removeChild(parent.lastElementChild);
+    }
 }
 
 function renderAirplanes() {
@@ -333,11 +485,14 @@ async function transferBooking() {
 
             // Обновляем данные
             await loadFlights();
+            refreshStatsAfterWrite();
 
             // Перезагружаем брони текущего рейса
             const bookings = await loadBookings(currentFlightId);
             renderBookingsTable(bookings);
 
+        } else if (isOverloaded(response)) {
+            showMessage(overloadMessage(response), 'warning');
         } else {
             showMessage(data.error || 'Ошибка переноса', 'danger');
         }
@@ -380,7 +535,10 @@ async function deleteFlightConfirm(flightId, destination) {
         if (response.ok) {
             showMessage(data.message, 'success');
             // Обновляем список рейсов
-            await loadFlights();
+            await Promise.all([loadFlights(), loadDestinations()]);
+            refreshStatsAfterWrite();
+        } else if (isOverloaded(response)) {
+            showMessage(overloadMessage(response), 'warning');
         } else {
             showMessage(data.error || 'Ошибка удаления рейса', 'danger');
         }
@@ -433,11 +591,14 @@ async function addBooking() {
 
             // Обновляем данные
             await loadFlights();
+            refreshStatsAfterWrite();
 
             // Перезагружаем брони
             const bookings = await loadBookings(flightId);
             renderBookingsTable(bookings);
 
+        } else if (isOverloaded(response)) {
+            showMessage(overloadMessage(response), 'warning');
         } else {
             showMessage(data.error || 'Ошибка добавления', 'danger');
         }
@@ -469,11 +630,14 @@ async function deleteBooking(bookingId) {
 
             // Обновляем данные
             await loadFlights();
+            refreshStatsAfterWrite();
 
             // Перезагружаем брони
             const bookings = await loadBookings(currentFlightId);
             renderBookingsTable(bookings);
 
+        } else if (isOverloaded(response)) {
+            showMessage(overloadMessage(response), 'warning');
         } else {
             showMessage(data.error || 'Ошибка удаления', 'danger');
         }
@@ -578,8 +742,11 @@ async function saveFlight() {
             bootstrap.Modal.getInstance(document.getElementById('flightModal')).hide();
 
             // Обновляем данные
-            await loadFlights();
+            await Promise.all([loadFlights(), loadDestinations()]);
+            refreshStatsAfterWrite();
 
+        } else if (isOverloaded(response)) {
+            showMessage(overloadMessage(response), 'warning');
         } else {
             showMessage(data.error || 'Ошибка сохранения', 'danger');
         }
@@ -592,6 +759,34 @@ async function saveFlight() {
 }
 
 // Вспомогательные функции
+function isOverloaded(response) {
+    return response.status === 429 || response.status === 503;
+}
+
+function retryAfterMs(response) {
+    const seconds = parseInt(response.headers.get('Retry-After'), 10);
+    return seconds > 0 ? seconds * 1000 : DEFAULT_RETRY_AFTER_MS;
+}
+
+function overloadMessage(response) {
+    const seconds = Math.ceil(retryAfterMs(response) / 1000);
+    return `Сервер перегружен, повторите позже (через ${seconds} с)`;
+}
+
+// Откладывает повторную загрузку на время из Retry-After, возвращает текущие данные
+function scheduleReload(name, loader, response, currentValue) {
+    clearTimeout(reloadTimers[name]);
+    reloadTimers[name] = setTimeout(() => {
+        delete reloadTimers[name];
+        Promise.resolve(loader()).catch(error => {
+            console.error('Ошибка повторной загрузки:', error);
+        });
+    }, retryAfterMs(response));
+
+    showMessage(overloadMessage(response), 'warning');
+    return currentValue;
+}
+
 function populateAirplaneSelect() {
     const select = document.getElementById('airplaneSelect');
     if (!select) return;
@@ -633,65 +828,189 @@ function showLoading(show, text = 'Загрузка данных...') {
     }
 }
 
-function updateFilters() {
+function populateAirplaneFilter() {
     const filter = document.getElementById('airplaneFilter');
     if (!filter) return;
 
-    // Получаем уникальные самолеты
-    const uniqueAirplanes = [...new Set(flights.map(f => f.airplane.name))];
-
+    const selected = filter.value;
     let options = '<option value="">Все самолеты</option>';
-    uniqueAirplanes.forEach(airplane => {
-        options += `<option value="${airplane}">${airplane}</option>`;
+    airplanes.forEach(airplane => {
+        options += `<option value="${airplane.id}">${airplane.name}</option>`;
+    });
+
+    filter.innerHTML = options;
+    filter.value = selected;
+}
+
+function populateDestinationFilter(destinations) {
+    const filter = document.getElementById('destinationFilter');
+    if (!filter) return;
+
+    const selected = filter.value;
+    let options = '<option value="">Все направления</option>';
+    destinations.forEach(item => {
+        options += `<option value="${item.destination}">${item.destination} (${item.flights_count})</option>`;
     });
 
     filter.innerHTML = options;
+    filter.value = selected;
+}
+
+function buildFlightsQuery() {
+    const params = new URLSearchParams();
+
+    const search = document.getElementById('searchInput')?.value.trim() || '';
+    const destination = document.getElementById('destinationFilter')?.value || '';
+    const airplaneId = document.getElementById('airplaneFilter')?.value || '';
+    const availability = document.getElementById('availabilityFilter')?.value || '';
+
+    if (search) params.set('search', search);
+    if (destination) params.set('destination', destination);
+    if (airplaneId) params.set('airplane_id', airplaneId);
+    if (availability) params.set('availability', availability);
+
+    const query = params.toString();
+    return query ? `?${query}` : '';
 }
 
+// Фильтрация выполняется на сервере, запрос отправляется после паузы во вводе
 function filterFlights() {
-    const searchTerm = document.getElementById('searchInput')?.value.toLowerCase() || '';
-    const airplaneFilter = document.getElementById('airplaneFilter')?.value || '';
-    const availabilityFilter = document.getElementById('availabilityFilter')?.value || '';
-
-    const filtered = flights.filter(flight => {
-        // Поиск по направлению
-        const matchesSearch = flight.destination.toLowerCase().includes(searchTerm);
-
-        // Фильтр по самолету
-        const matchesAirplane = !airplaneFilter || flight.airplane.name === airplaneFilter;
-
-        // Фильтр по доступности
-        let matchesAvailability = true;
-        if (availabilityFilter === 'available') {
-            matchesAvailability = flight.available_seats > 0;
-        } else if (availabilityFilter === 'full') {
-            matchesAvailability = flight.available_seats <= 0;
+    clearTimeout(filterDebounceTimer);
+    filterDebounceTimer = setTimeout(() => {
+        filterDebounceTimer = null;
+        const viewport = document.getElementById('flightsViewport');
+        if (viewport) viewport.scrollTop = 0;
+        loadFlights().catch(error => {
+            showMessage('Ошибка фильтрации: ' + error.message, 'danger');
+        });
+    }, FILTER_DEBOUNCE_MS);
+}
+
+// Статистика считается на сервере и отдается готовым снимком
+async function updateStats() {
+    try {
+        const response = await fetch('/api/stats');
+        if (isOverloaded(response)) return scheduleReload('stats', updateStats, response, null);
+        if (!response.ok) throw new Error('Ошибка загрузки статистики');
+        const stats = await response.json();
+        const totals = stats.totals;
+
+        document.getElementById('totalFlights').textContent = totals.flights_count;
+        document.getElementById('totalAirplanes').textContent = totals.airplanes_count;
+
+        const statsInfo = document.getElementById('statsInfo');
+        if (statsInfo) {
+            statsInfo.textContent = `Рейсы: ${totals.flights_count} | Самолеты: ${totals.airplanes_count} | Брони: ${totals.bookings_count} | Загрузка: ${formatPercent(totals.load_factor)}`;
         }
 
-        return matchesSearch && matchesAirplane && matchesAvailability;
-    });
+        renderDashboard(stats);
+        return stats;
+    } catch (error) {
+        console.error('Ошибка статистики:', error);
+    }
+}
 
-    // Временно заменяем flights для рендеринга
-    const originalFlights = flights;
-    flights = filtered;
-    renderFlights();
-    flights = originalFlights;
+// После изменений данных запрашивает статистику, когда сервер успеет ее пересчитать
+function refreshStatsAfterWrite() {
+    clearTimeout(statsAfterWriteTimer);
+    statsAfterWriteTimer = setTimeout(() => {
+        statsAfterWriteTimer = null;
+        updateStats();
+    }, STATS_AFTER_WRITE_MS);
 }
 
-function updateStats() {
-    const totalFlights = flights.length;
-    const totalAirplanes = airplanes.length;
+function formatPercent(value) {
+    return `${(value * 100).toFixed(1)}%`;
+}
 
-    document.getElementById('totalFlights').textContent = totalFlights;
-    document.getElementById('totalAirplanes').textContent = totalAirplanes;
+function loadFactorBadge(value) {
+    let badgeClass = 'bg-success';
+    if (value >= 0.9) {
+        badgeClass = 'bg-danger';
+    } else if (value >= 0.7) {
+        badgeClass = 'bg-warning text-dark';
+    }
+    return `<span class="badge ${badgeClass}">${formatPercent(value)}</span>`;
+}
 
-    // Подсчитываем общее количество броней
-    const totalBookings = flights.reduce((sum, flight) => sum + flight.bookings_count, 0);
+function fillStatsTable(tableId, items, columns, emptyText, renderRow) {
+    const table = document.getElementById(tableId);
+    if (!table) return;
 
-    const statsInfo = document.getElementById('statsInfo');
-    if (statsInfo) {
-        statsInfo.textContent = `Рейсы: ${totalFlights} | Самолеты: ${totalAirplanes} | Брони: ${totalBookings}`;
+    if (!items || items.length === 0) {
+        table.innerHTML = `
+            <tr>
+                <td colspan="${columns}" class="text-center">${emptyText}</td>
+            </tr>
+        `;
+        return;
     }
+
+    table.innerHTML = items.map(renderRow).join('');
+}
+
+function renderDashboard(stats) {
+    const summary = document.getElementById('statsSummary');
+    if (!summary) return;
+
+    const totals = stats.totals;
+    summary.innerHTML = `
+        <div class="col-md-3"><div class="card"><div class="card-body">
+            <small class="text-muted">Рейсы</small><h4 class="mb-0">${totals.flights_count}</h4>
+        </div></div></div>
+        <div class="col-md-3"><div class="card"><div class="card-body">
+            <small class="text-muted">Брони</small><h4 class="mb-0">${totals.bookings_count}</h4>
+        </div></div></div>
+        <div class="col-md-3"><div class="card"><div class="card-body">
+            <small class="text-muted">Мест всего</small><h4 class="mb-0">${totals.capacity}</h4>
+        </div></div></div>
+        <div class="col-md-3"><div class="card"><div class="card-body">
+            <small class="text-muted">Средняя загрузка</small><h4 class="mb-0">${formatPercent(totals.load_factor)}</h4>
+        </div></div></div>
+    `;
+
+    const generatedAt = document.getElementById('statsGeneratedAt');
+    if (generatedAt) {
+        generatedAt.textContent = new Date(stats.generated_at).toLocaleString('ru-RU');
+    }
+
+    fillStatsTable('nearFullTable', stats.near_full_flights, 5, 'Почти заполненных рейсов нет', flight => `
+        <tr>
+            <td>${new Date(flight.departure_datetime).toLocaleString('ru-RU')}</td>
+            <td>${flight.destination}</td>
+            <td>${flight.airplane_name}</td>
+            <td>${flight.available_seats}</td>
+            <td>${loadFactorBadge(flight.load_factor)}</td>
+        </tr>
+    `);
+
+    fillStatsTable('destinationStatsTable', stats.by_destination, 4, 'Нет данных', item => `
+        <tr>
+            <td>${item.destination}</td>
+            <td>${item.flights_count}</td>
+            <td>${item.bookings_count} / ${item.capacity}</td>
+            <td>${loadFactorBadge(item.load_factor)}</td>
+        </tr>
+    `);
+
+    fillStatsTable('dayStatsTable', stats.by_day, 4, 'Нет данных', item => `
+        <tr>
+            <td>${new Date(item.day).toLocaleDateString('ru-RU')}</td>
+            <td>${item.flights_count}</td>
+            <td>${item.bookings_count} / ${item.capacity}</td>
+            <td>${loadFactorBadge(item.load_factor)}</td>
+        </tr>
+    `);
+
+    fillStatsTable('airplaneStatsTable', stats.airplanes, 5, 'Нет данных', item => `
+        <tr>
+            <td>${item.name}</td>
+            <td>${item.flights_count}</td>
+            <td>${item.upcoming_flights_count}</td>
+            <td>${item.bookings_count}</td>
+            <td>${loadFactorBadge(item.utilization)}</td>
+        </tr>
+    `);
 }
 
 function setupEventListeners() {
@@ -708,11 +1027,16 @@ function setupEventListeners() {
             tab.classList.add('active');
             const tabName = tab.getAttribute('data-tab');
             document.getElementById(`${tabName}Content`).style.display = 'block';
+
+            if (tabName === 'flights') {
+                renderVisibleFlights();
+            }
         });
     });
 
     // Фильтрация
     document.getElementById('searchInput')?.addEventListener('input', filterFlights);
+    document.getElementById('destinationFilter')?.addEventListener('change', filterFlights);
     document.getElementById('airplaneFilter')?.addEventListener('change', filterFlights);
     document.getElementById('availabilityFilter')?.addEventListener('change', filterFlights);
 
@@ -748,4 +1072,5 @@ window.showAddBookingModal = showAddBookingModal;
 window.addBooking = addBooking;
 window.refreshData = loadInitialData;
 window.refreshAirplanes = loadAirplanes;
-window.filterFlights = filterFlights;
\ No newline at end of file
+window.filterFlights = filterFlights;
+window.refreshStats = updateStats;
\ No newline at end of file
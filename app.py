@@ -1,10 +1,16 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, g
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import mysql.connector
 from mysql.connector import Error
 import uuid
 from datetime import datetime
 import logging
+from collections import OrderedDict
+import heapq
+import math
+import threading
+import time
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +27,44 @@ DB_CONFIG = {
     'database': 'aviacompany_db'
 }
 
+# ========== КОНФИГУРАЦИЯ СТАТИСТИКИ ==========
+STATS_CONFIG = {
+    'refresh_interval': 30,       # Максимальный возраст снимка статистики (сек)
+    'min_refresh_interval': 5,    # Минимальный интервал пересчета после изменений (сек)
+    'near_full_threshold': 0.9,   # Загрузка, начиная с которой рейс считается почти полным
+    'near_full_limit': 20         # Сколько ближайших почти полных рейсов возвращать
+}
+
+# ========== КОНФИГУРАЦИЯ ОГРАНИЧЕНИЯ НАГРУЗКИ ==========
+# Лимиты запросов на одного клиента (token bucket): скорость пополнения в секунду и запас.
+# Клиент определяется по request.remote_addr. За обратным прокси это адрес прокси,
+# и все пользователи делят одну корзину - тогда укажите число доверенных прокси
+# в 'trusted_proxies', чтобы адрес клиента брался из X-Forwarded-For
+RATE_LIMIT_CONFIG = {
+    'enabled': True,
+    'read': {'rate': 10, 'burst': 20},
+    'write': {'rate': 5, 'burst': 10},
+    'max_clients': 10000,         # Максимум хранимых корзин, старейшие вытесняются
+    'trusted_proxies': 0
+}
+
+if RATE_LIMIT_CONFIG['trusted_proxies']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=RATE_LIMIT_CONFIG['trusted_proxies'])
+
+# Ограничение одновременной работы с БД
+ADMISSION_CONFIG = {
+    'enabled': True,
+    'max_concurrent': 10,         # Всего одновременных запросов к БД
+    'reserved_for_bookings': 3,   # Из них только для броней и переносов
+    'max_read_queue': 20,         # Сколько GET-запросов может ждать слот
+    'queue_timeout': {            # Сколько запрос ждет слот (сек)
+        'booking': 5.0,
+        'write': 2.0,
+        'read': 0.5
+    },
+    'retry_after': 1              # Значение Retry-After при перегрузке (сек)
+}
+
 
 def get_db_connection():
     """Создает соединение с базой данных"""
@@ -49,6 +93,164 @@ def format_datetime(dt):
     return dt
 
 
+# ========== ОГРАНИЧЕНИЕ НАГРУЗКИ ==========
+
+# Приоритеты от высшего к низшему
+PRIORITIES = ('booking', 'write', 'read')
+
+# Операции с бронями, для которых резервируются слоты БД
+BOOKING_ENDPOINTS = {'create_booking', 'delete_booking', 'transfer_booking'}
+
+# Обработчики, которые не обращаются к БД (статистика отдается из снимка в памяти)
+NO_DB_ENDPOINTS = {'get_stats'}
+
+# Корзины в порядке последнего обращения: в начале - давно неактивные клиенты
+_rate_buckets = OrderedDict()
+_rate_lock = threading.Lock()
+
+_admission = {
+    'active': 0,
+    'waiting': {priority: 0 for priority in PRIORITIES}
+}
+_admission_cond = threading.Condition()
+
+
+def request_priority():
+    """Определяет приоритет текущего запроса"""
+    if request.endpoint in BOOKING_ENDPOINTS:
+        return 'booking'
+    if request.method == 'GET':
+        return 'read'
+    return 'write'
+
+
+def evict_rate_buckets(now):
+    """Удаляет корзины с начала очереди: уже полные или сверх лимита размера"""
+    while _rate_buckets:
+        key, bucket = next(iter(_rate_buckets.items()))
+        limits = RATE_LIMIT_CONFIG[key[1]]
+        refilled = bucket['tokens'] + (now - bucket['updated']) * limits['rate'] >= limits['burst']
+        if not refilled and len(_rate_buckets) < RATE_LIMIT_CONFIG['max_clients']:
+            break
+        _rate_buckets.popitem(last=False)
+
+
+def take_rate_token(client, priority):
+    """Списывает токен из корзины клиента, возвращает время ожидания (0 - разрешено)"""
+    kind = 'read' if priority == 'read' else 'write'
+    limits = RATE_LIMIT_CONFIG[kind]
+    now = time.monotonic()
+
+    with _rate_lock:
+        # Каждый запрос удаляет не больше корзин, чем было создано, поэтому очистка амортизирована
+        evict_rate_buckets(now)
+
+        key = (client, kind)
+        bucket = _rate_buckets.get(key)
+        if bucket is None:
+            bucket = _rate_buckets[key] = {'tokens': limits['burst'], 'updated': now}
+        else:
+            _rate_buckets.move_to_end(key)
+
+        bucket['tokens'] = min(limits['burst'], bucket['tokens'] + (now - bucket['updated']) * limits['rate'])
+        bucket['updated'] = now
+
+        if bucket['tokens'] >= 1:
+            bucket['tokens'] -= 1
+            return 0
+
+        return (1 - bucket['tokens']) / limits['rate']
+
+
+def db_slot_available(priority):
+    """Проверяет, может ли запрос с данным приоритетом занять слот БД"""
+    limit = ADMISSION_CONFIG['max_concurrent']
+    if priority != 'booking':
+        limit -= ADMISSION_CONFIG['reserved_for_bookings']
+    if _admission['active'] >= limit:
+        return False
+
+    # Запросы с более высоким приоритетом обслуживаются первыми
+    for higher in PRIORITIES[:PRIORITIES.index(priority)]:
+        if _admission['waiting'][higher]:
+            return False
+    return True
+
+
+def acquire_db_slot(priority):
+    """Занимает слот БД, ожидая в очереди не дольше таймаута приоритета"""
+    deadline = time.monotonic() + ADMISSION_CONFIG['queue_timeout'][priority]
+
+    with _admission_cond:
+        if db_slot_available(priority):
+            _admission['active'] += 1
+            return True
+
+        # При переполнении очереди чтения сразу отклоняем запрос
+        if priority == 'read' and _admission['waiting']['read'] >= ADMISSION_CONFIG['max_read_queue']:
+            return False
+
+        _admission['waiting'][priority] += 1
+        try:
+            while not db_slot_available(priority):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                _admission_cond.wait(remaining)
+            _admission['active'] += 1
+            return True
+        finally:
+            _admission['waiting'][priority] -= 1
+            _admission_cond.notify_all()
+
+
+def release_db_slot():
+    """Освобождает слот БД"""
+    with _admission_cond:
+        _admission['active'] -= 1
+        _admission_cond.notify_all()
+
+
+def overload_response(message, status, retry_after):
+    """Ответ при превышении лимитов с заголовком Retry-After"""
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+@app.before_request
+def admission_control():
+    """Ограничение частоты запросов клиента и одновременной работы с БД"""
+    if not request.path.startswith('/api/') or request.method == 'OPTIONS':
+        return None
+
+    priority = request_priority()
+
+    if RATE_LIMIT_CONFIG['enabled']:
+        retry_after = take_rate_token(request.remote_addr, priority)
+        if retry_after:
+            logger.warning(f"Превышен лимит запросов клиента {request.remote_addr} ({priority})")
+            return overload_response('Слишком много запросов, повторите позже', 429, retry_after)
+
+    if not ADMISSION_CONFIG['enabled'] or request.endpoint in NO_DB_ENDPOINTS:
+        return None
+
+    if not acquire_db_slot(priority):
+        logger.warning(f"Запрос {request.method} {request.path} отклонен: сервер перегружен")
+        return overload_response('Сервер перегружен, повторите позже', 503, ADMISSION_CONFIG['retry_after'])
+
+    g.db_slot_acquired = True
+    return None
+
+
+@app.teardown_request
+def release_admission(exc):
+    """Освобождает слот БД после обработки запроса"""
+    if g.pop('db_slot_acquired', False):
+        release_db_slot()
+
+
 # ========== API ДЛЯ САМОЛЕТОВ ==========
 
 @app.route('/api/airplanes', methods=['GET'])
@@ -76,15 +278,44 @@ def get_airplanes():
 
 @app.route('/api/flights', methods=['GET'])
 def get_flights():
-    """Получить все рейсы с информацией о свободных местах"""
+    """Получить рейсы с информацией о свободных местах (с фильтрами)"""
     try:
+        # Фильтры: search - подстрока направления, destination - точное направление,
+        # airplane_id - самолет, availability - available/full
+        search = request.args.get('search', '').strip()
+        destination = request.args.get('destination', '').strip()
+        airplane_id = request.args.get('airplane_id', '').strip()
+        availability = request.args.get('availability', '').strip()
+
+        conditions = []
+        params = []
+        if search:
+            # Экранируем спецсимволы LIKE, чтобы поиск был по подстроке
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("f.destination LIKE %s")
+            params.append(f"%{escaped}%")
+        if destination:
+            conditions.append("f.destination = %s")
+            params.append(destination)
+        if airplane_id:
+            conditions.append("f.airplane_id = %s")
+            params.append(airplane_id)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        having_clause = ''
+        if availability == 'available':
+            having_clause = 'HAVING available_seats > 0'
+        elif availability == 'full':
+            having_clause = 'HAVING available_seats <= 0'
+
         connection = get_db_connection()
         if not connection:
             return jsonify({'error': 'Нет подключения к базе данных'}), 500
 
         cursor = connection.cursor(dictionary=True)
 
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT 
                 f.id,
                 f.departure_datetime,
@@ -97,9 +328,11 @@ def get_flights():
             FROM flights f
             JOIN airplanes a ON f.airplane_id = a.id
             LEFT JOIN bookings b ON f.id = b.flight_id
+            {where_clause}
             GROUP BY f.id
+            {having_clause}
             ORDER BY f.departure_datetime DESC
-        ''')
+        ''', tuple(params))
 
         flights = cursor.fetchall()
 
@@ -121,6 +354,32 @@ def get_flights():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/destinations', methods=['GET'])
+def get_destinations():
+    """Получить список направлений с количеством рейсов"""
+    try:
+        connection = get_db_connection()
+        if not connection:
+            return jsonify({'error': 'Нет подключения к базе данных'}), 500
+
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute('''
+            SELECT destination, COUNT(*) as flights_count
+            FROM flights
+            GROUP BY destination
+            ORDER BY destination
+        ''')
+        destinations = cursor.fetchall()
+
+        cursor.close()
+        connection.close()
+
+        return jsonify(destinations)
+    except Exception as e:
+        logger.error(f"Ошибка получения направлений: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/flights', methods=['POST'])
 def create_flight():
     """Создать новый рейс"""
@@ -166,6 +425,7 @@ def create_flight():
         )
 
         connection.commit()
+        invalidate_stats()
 
         cursor.close()
         connection.close()
@@ -228,6 +488,7 @@ def update_flight(flight_id):
         )
 
         connection.commit()
+        invalidate_stats()
 
         cursor.close()
         connection.close()
@@ -290,6 +551,7 @@ def delete_flight(flight_id):
             return jsonify({'error': 'Не удалось удалить рейс'}), 500
 
         connection.commit()
+        invalidate_stats()
 
         logger.info(f"Рейс {flight_id} успешно удален")
         return jsonify({'message': 'Рейс успешно удален'})
@@ -415,6 +677,7 @@ def create_booking(flight_id):
         )
 
         connection.commit()
+        invalidate_stats()
 
         cursor.close()
         connection.close()
@@ -445,6 +708,7 @@ def delete_booking(booking_id):
             return jsonify({'error': 'Бронь не найдена'}), 404
 
         connection.commit()
+        invalidate_stats()
 
         cursor.close()
         connection.close()
@@ -630,6 +894,7 @@ def transfer_booking(booking_id):
             raise Exception('Не удалось обновить бронь')
 
         connection.commit()
+        invalidate_stats()
 
         logger.info(f"Бронь {booking_id} успешно перенесена с рейса {current_flight_id} на рейс {new_flight_id}")
 
@@ -652,6 +917,209 @@ def transfer_booking(booking_id):
             connection.close()
 
 
+# ========== СТАТИСТИКА ==========
+
+# Снимок статистики пересчитывается в фоновом потоке: раз в refresh_interval,
+# а после изменений данных - не чаще min_refresh_interval.
+# Запросы к /api/stats только читают готовый снимок
+_stats_snapshot = {'data': None, 'computed_at': 0.0}
+_stats_wakeup = threading.Event()   # Установлен - снимок устарел из-за изменений
+_stats_ready = threading.Event()    # Установлен - первый снимок посчитан
+_stats_refresher = {'thread': None}
+_stats_refresher_lock = threading.Lock()
+
+# Загрузка каждого рейса - единственный тяжелый запрос при пересчете
+FLIGHT_LOADS_QUERY = '''
+    SELECT
+        f.id,
+        f.departure_datetime,
+        f.destination,
+        f.airplane_id,
+        a.name as airplane_name,
+        a.capacity,
+        COUNT(b.id) as bookings_count
+    FROM flights f
+    JOIN airplanes a ON f.airplane_id = a.id
+    LEFT JOIN bookings b ON f.id = b.flight_id
+    GROUP BY f.id
+'''
+
+
+def load_factor(bookings, capacity):
+    """Доля занятых мест"""
+    if not capacity:
+        return 0.0
+    return round(bookings / capacity, 4)
+
+
+def invalidate_stats():
+    """Помечает снимок статистики устаревшим после изменения данных"""
+    _stats_wakeup.set()
+
+
+def add_load(totals, bookings, capacity):
+    """Добавляет рейс в агрегат (рейсы, брони, места)"""
+    totals['flights_count'] += 1
+    totals['bookings_count'] += bookings
+    totals['capacity'] += capacity
+
+
+def finish_load(totals):
+    """Добавляет в агрегат коэффициент загрузки"""
+    totals['load_factor'] = load_factor(totals['bookings_count'], totals['capacity'])
+    return totals
+
+
+def compute_stats(cursor):
+    """Считает агрегированную статистику за один проход по рейсам"""
+    cursor.execute("SELECT id, name, capacity FROM airplanes ORDER BY name")
+    airplanes = {
+        airplane['id']: {
+            'id': airplane['id'],
+            'name': airplane['name'],
+            'capacity': airplane['capacity'],
+            'flights_count': 0,
+            'upcoming_flights_count': 0,
+            'bookings_count': 0
+        }
+        for airplane in cursor.fetchall()
+    }
+
+    def empty_load():
+        return {'flights_count': 0, 'bookings_count': 0, 'capacity': 0}
+
+    totals = empty_load()
+    by_destination = {}
+    by_day = {}
+    near_full_flights = []
+    now = datetime.now()
+    threshold = STATS_CONFIG['near_full_threshold']
+
+    cursor.execute(FLIGHT_LOADS_QUERY)
+    for flight in cursor:
+        bookings, capacity = flight['bookings_count'], flight['capacity']
+        departure = flight['departure_datetime']
+
+        add_load(totals, bookings, capacity)
+        add_load(by_destination.setdefault(flight['destination'], empty_load()), bookings, capacity)
+        add_load(by_day.setdefault(departure.date(), empty_load()), bookings, capacity)
+
+        airplane = airplanes.get(flight['airplane_id'])
+        if airplane:
+            airplane['flights_count'] += 1
+            airplane['bookings_count'] += bookings
+            if departure >= now:
+                airplane['upcoming_flights_count'] += 1
+
+        if departure >= now and bookings >= capacity * threshold:
+            near_full_flights.append(flight)
+
+    near_full_flights = heapq.nsmallest(
+        STATS_CONFIG['near_full_limit'], near_full_flights, key=lambda f: f['departure_datetime']
+    )
+
+    return {
+        'generated_at': format_datetime(now),
+        'totals': dict(finish_load(totals), airplanes_count=len(airplanes)),
+        'by_destination': [
+            dict(finish_load(load), destination=destination)
+            for destination, load in sorted(by_destination.items())
+        ],
+        'by_day': [
+            dict(finish_load(load), day=day.isoformat())
+            for day, load in sorted(by_day.items())
+        ],
+        'airplanes': [
+            dict(airplane, utilization=load_factor(
+                airplane['bookings_count'], airplane['capacity'] * airplane['flights_count']
+            ))
+            for airplane in airplanes.values()
+        ],
+        'near_full_flights': [
+            {
+                'id': flight['id'],
+                'departure_datetime': format_datetime(flight['departure_datetime']),
+                'destination': flight['destination'],
+                'airplane_name': flight['airplane_name'],
+                'capacity': flight['capacity'],
+                'bookings_count': flight['bookings_count'],
+                'available_seats': flight['capacity'] - flight['bookings_count'],
+                'load_factor': load_factor(flight['bookings_count'], flight['capacity'])
+            }
+            for flight in near_full_flights
+        ],
+        'near_full_threshold': threshold
+    }
+
+
+def refresh_stats_snapshot():
+    """Пересчитывает снимок статистики"""
+    connection = get_db_connection()
+    if not connection:
+        raise Exception('Нет подключения к базе данных')
+
+    try:
+        cursor = connection.cursor(dictionary=True)
+        data = compute_stats(cursor)
+        cursor.close()
+    finally:
+        connection.close()
+
+    _stats_snapshot['data'] = data
+    _stats_snapshot['computed_at'] = time.monotonic()
+    _stats_ready.set()
+
+
+def stats_refresher():
+    """Фоновый поток пересчета статистики"""
+    while True:
+        started = time.monotonic()
+        _stats_wakeup.clear()
+        try:
+            refresh_stats_snapshot()
+        except Exception as e:
+            logger.error(f"Ошибка пересчета статистики: {e}")
+            # Снимок остался устаревшим - повторим после min_refresh_interval
+            _stats_wakeup.set()
+
+        _stats_wakeup.wait(STATS_CONFIG['refresh_interval'])
+
+        # После изменений данных пересчитываем не чаще min_refresh_interval
+        elapsed = time.monotonic() - started
+        if elapsed < STATS_CONFIG['min_refresh_interval']:
+            time.sleep(STATS_CONFIG['min_refresh_interval'] - elapsed)
+
+
+@app.before_request
+def ensure_stats_refresher():
+    """Запускает фоновый поток пересчета статистики при первом запросе"""
+    if _stats_refresher['thread'] is not None:
+        return
+
+    with _stats_refresher_lock:
+        if _stats_refresher['thread'] is None:
+            thread = threading.Thread(target=stats_refresher, name='stats-refresher', daemon=True)
+            thread.start()
+            _stats_refresher['thread'] = thread
+
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Получить агрегированную статистику (загрузка рейсов, самолетов)"""
+    try:
+        # Запрос не ждет пересчета: пока первого снимка нет, клиент повторит позже
+        if not _stats_ready.is_set():
+            response = jsonify({'error': 'Статистика еще не готова, повторите позже'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(STATS_CONFIG['min_refresh_interval'])
+            return response
+
+        return jsonify(_stats_snapshot['data'])
+    except Exception as e:
+        logger.error(f"Ошибка получения статистики: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 # ========== СТАТУС СИСТЕМЫ ==========
 
 @app.route('/api/status', methods=['GET'])
@@ -0,0 +1,56 @@
+"""Ограничение частоты запросов и контроль допуска к БД."""
+import threading
+from collections import OrderedDict
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # База недоступна, фоновый пересчет статистики не запускается
+    monkeypatch.setattr(app_module, 'get_db_connection', lambda: None)
+    monkeypatch.setitem(app_module._stats_refresher, 'thread', object())
+    monkeypatch.setattr(app_module, '_stats_ready', threading.Event())
+    monkeypatch.setattr(app_module, '_rate_buckets', OrderedDict())
+    monkeypatch.setitem(app_module._admission, 'active', 0)
+    return app_module.app.test_client()
+
+
+def test_read_rate_limit_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMIT_CONFIG, 'read', {'rate': 1, 'burst': 2})
+
+    statuses = [client.get('/api/flights').status_code for _ in range(3)]
+    response = client.get('/api/flights')
+
+    assert statuses[:2] == [500, 500]
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_reads_do_not_use_reserved_slots(client):
+    limit = app_module.ADMISSION_CONFIG['max_concurrent'] - app_module.ADMISSION_CONFIG['reserved_for_bookings']
+    app_module._admission['active'] = limit
+
+    read = client.get('/api/destinations')
+    booking = client.post('/api/flights/flight-1/bookings', json={'passenger_name': 'Иванов'})
+
+    assert read.status_code == 503
+    assert 'Retry-After' in read.headers
+    # Бронь получает зарезервированный слот и доходит до обработчика
+    assert booking.status_code == 500
+    assert app_module._admission['active'] == limit
+
+
+def test_stats_do_not_take_db_slots(client):
+    limit = app_module.ADMISSION_CONFIG['max_concurrent'] - app_module.ADMISSION_CONFIG['reserved_for_bookings']
+    app_module._admission['active'] = limit
+
+    response = client.get('/api/stats')
+
+    # Снимка еще нет: ответ сразу, без ожидания и без занятия слота БД
+    assert response.status_code == 503
+    assert response.get_json()['error'] == 'Статистика еще не готова, повторите позже'
+    assert 'Retry-After' in response.headers
+    assert app_module._admission['active'] == limit
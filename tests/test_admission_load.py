@@ -0,0 +1,208 @@
+"""Нагрузочный тест: задержка создания броней под потоком чтения рейсов.
+
+Приложение запускается в многопоточном сервере werkzeug, база данных заменена
+заглушкой с ограниченным пулом соединений (как max_connections у MySQL) и
+фиксированной задержкой каждого запроса. Много потоков непрерывно читают
+GET /api/flights, а один поток создает брони через
+POST /api/flights/<id>/bookings. Сравниваются режимы с контролем допуска
+и без него.
+
+Тесты помечены load и по умолчанию пропускаются.
+Запуск с выводом отчета: pytest -m load -s tests/test_admission_load.py
+"""
+import http.client
+import json
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import pytest
+from werkzeug.serving import make_server
+
+import app as app_module
+
+DB_POOL_SIZE = 10          # Сколько соединений выдает база
+DB_QUERY_LATENCY = 0.01    # Задержка одного запроса к БД (сек)
+READER_THREADS = 40        # Потоков, читающих список рейсов
+BOOKINGS = 100             # Сколько броней создает поток записи
+WARMUP = 0.5               # Время разгона потока чтения перед записью (сек)
+WRITE_P99_LIMIT = 3.0      # Допустимый p99 создания брони с запасом для медленных машин (сек)
+
+pytestmark = pytest.mark.load
+
+
+class FakeCursor:
+    """Курсор-заглушка: отвечает на запросы создания брони и списка рейсов"""
+
+    def __init__(self):
+        self.rowcount = 0
+        self._row = None
+
+    def execute(self, query, params=None):
+        time.sleep(DB_QUERY_LATENCY)
+        self.rowcount = 1
+        if 'COUNT(*)' in query:
+            self._row = {'count': 0}
+        elif 'a.capacity' in query and 'WHERE f.id' in query:
+            self._row = {
+                'id': params[0],
+                'departure_datetime': datetime(2030, 1, 1, 12, 0),
+                'destination': 'Москва',
+                'capacity': 1000
+            }
+        else:
+            self._row = None
+
+    def fetchone(self):
+        return self._row
+
+    def fetchall(self):
+        return []
+
+    def __iter__(self):
+        return iter([])
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Соединение-заглушка, при закрытии возвращает место в пул"""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._open = True
+
+    def cursor(self, dictionary=False):
+        return FakeCursor()
+
+    def commit(self):
+        time.sleep(DB_QUERY_LATENCY)
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return self._open
+
+    def close(self):
+        if self._open:
+            self._open = False
+            self._pool.release()
+
+
+def make_fake_db():
+    """Возвращает замену get_db_connection с пулом из DB_POOL_SIZE соединений"""
+    pool = threading.BoundedSemaphore(DB_POOL_SIZE)
+
+    def get_db_connection():
+        # Как при исчерпании соединений MySQL: подключиться не удалось
+        if not pool.acquire(blocking=False):
+            return None
+        return FakeConnection(pool)
+
+    return get_db_connection
+
+
+def send(port, method, path, payload=None):
+    """Отправляет запрос и возвращает код ответа"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+def run_load(port):
+    """Создает брони под потоком чтения и собирает задержки и коды ответов"""
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_statuses = Counter()
+
+    def reader():
+        while not stop.is_set():
+            status = send(port, 'GET', '/api/flights')
+            with lock:
+                read_statuses[status] += 1
+
+    readers = [threading.Thread(target=reader, daemon=True) for _ in range(READER_THREADS)]
+    for thread in readers:
+        thread.start()
+    time.sleep(WARMUP)
+
+    write_latencies = []
+    write_statuses = Counter()
+    try:
+        for i in range(BOOKINGS):
+            started = time.perf_counter()
+            status = send(port, 'POST', '/api/flights/flight-1/bookings', {'passenger_name': f'Пассажир {i}'})
+            write_latencies.append(time.perf_counter() - started)
+            write_statuses[status] += 1
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+    return {
+        'write_p50': percentile(write_latencies, 0.50),
+        'write_p99': percentile(write_latencies, 0.99),
+        'write_statuses': dict(write_statuses),
+        'read_statuses': dict(read_statuses)
+    }
+
+
+def report(mode, result):
+    print(
+        f"\n[{mode}] брони: p50={result['write_p50'] * 1000:.1f} мс, "
+        f"p99={result['write_p99'] * 1000:.1f} мс, коды={result['write_statuses']}; "
+        f"чтение: коды={result['read_statuses']} "
+        f"(429: {result['read_statuses'].get(429, 0)}, 503: {result['read_statuses'].get(503, 0)})"
+    )
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(app_module, 'get_db_connection', make_fake_db())
+    # Все запросы идут с одного адреса, поэтому лимит на клиента отключен,
+    # чтобы поток чтения доходил до контроля допуска
+    monkeypatch.setitem(app_module.RATE_LIMIT_CONFIG, 'enabled', False)
+
+    http_server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server.server_port
+    http_server.shutdown()
+    thread.join()
+
+
+def test_bookings_stay_fast_with_admission_control(server):
+    result = run_load(server)
+    report('контроль допуска включен', result)
+
+    assert result['write_statuses'] == {201: BOOKINGS}
+    assert result['write_p99'] < WRITE_P99_LIMIT
+    # Нагрузку сбрасывают чтения, а не записи
+    assert result['read_statuses'].get(503, 0) > 0
+
+
+def test_bookings_fail_without_admission_control(server, monkeypatch):
+    monkeypatch.setitem(app_module.ADMISSION_CONFIG, 'enabled', False)
+
+    result = run_load(server)
+    report('контроль допуска выключен', result)
+
+    # Поток чтения занимает все соединения, и часть броней получает
+    # "Нет подключения к базе данных"
+    assert result['write_statuses'].get(500, 0) > 0